@@ -3,6 +3,27 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+def _env_int(name: str, default: int, minimum: int = 1) -> int:
+    try:
+        return max(minimum, int(os.getenv(name, "") or default))
+    except ValueError:
+        return default
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "") or default)
+    except ValueError:
+        return default
+
+def _env_map(name: str) -> dict:
+    """'en=foo,hi=/models/bar' -> {'en': 'foo', 'hi': '/models/bar'}"""
+    out = {}
+    for item in (os.getenv(name, "") or "").split(","):
+        k, sep, v = item.partition("=")
+        if sep and k.strip() and v.strip():
+            out[k.strip()] = v.strip()
+    return out
+
 # load .env from backend/ (one level above /app)
 BACKEND_DIR = Path(__file__).resolve().parent.parent.parent
 ENV_FILE = BACKEND_DIR / ".env"
@@ -13,6 +34,36 @@ if ENV_FILE.exists():
 USE_XTTS = os.getenv("USE_XTTS", "0") in ("1", "true", "True")
 XTTS_LANGUAGE = os.getenv("XTTS_LANGUAGE") or "en"
 XTTS_REFERENCE_VOICE = os.getenv("XTTS_REFERENCE_VOICE") or ""
+# per-language XTTS fine-tunes: model name or local model dir (with config.json)
+XTTS_MODELS = _env_map("XTTS_MODELS")
+
+# --- Piper (optional; not wired yet) ---
+PIPER_BIN = os.getenv("PIPER_BIN", "")
+PIPER_MODEL = os.getenv("PIPER_MODEL", "")
+
+# --- fake engine (load testing) ---
+# >0 enables a model-free engine that sleeps RTF * audio duration and writes a
+# precomputed tone (near-zero CPU); "auto" prefers it so the HTTP stack can be
+# load-tested without a model
+TTS_FAKE_RTF = _env_float("TTS_FAKE_RTF", 0.0)
+
+# --- concurrency ---
+# number of XTTS model copies kept in memory; chunks of one /speak_long can run on all of them
+XTTS_REPLICAS = _env_int("XTTS_REPLICAS", 1)
+# per-request cap so one long document cannot take every replica
+SPEAK_LONG_MAX_PARALLEL = _env_int("SPEAK_LONG_MAX_PARALLEL", 2)
+# torch intra-op threads for the process; replicas share the cores instead of each
+# spawning one thread per core. 0 = auto (cpu_count // XTTS_REPLICAS)
+XTTS_TORCH_THREADS = _env_int("XTTS_TORCH_THREADS", 0, minimum=0)
+
+# --- model residency (services/engine_manager.py) ---
+# cap on the summed memory of loaded models (RSS growth measured at load); 0 = unlimited
+ENGINE_MEMORY_BUDGET_MB = _env_int("ENGINE_MEMORY_BUDGET_MB", 0, minimum=0)
+# unload a model after this many idle seconds; 0 = keep forever
+ENGINE_IDLE_UNLOAD_S = _env_int("ENGINE_IDLE_UNLOAD_S", 0, minimum=0)
+
+# warm the TTS model and content parsers in a background thread at startup
+PRELOAD_ON_STARTUP = os.getenv("PRELOAD_ON_STARTUP", "0") in ("1", "true", "True")
 
 # optional caches (safe if empty)
 HF_HOME = os.getenv("HF_HOME", "")
@@ -23,6 +74,12 @@ TORCH_HOME = os.getenv("TORCH_HOME", "")
 # coqui tos marker; we only read it—set from your shell/env
 COQUI_TOS_AGREED = os.getenv("COQUI_TOS_AGREED", "")
 
-# temp output directory
+# temp output directory (created on first write, not at import)
 TMP_OUT = BACKEND_DIR / "backend" / "data"
-TMP_OUT.mkdir(parents=True, exist_ok=True)
+
+# generated audio (services import this name)
+DATA_DIR = TMP_OUT
+
+# per-chunk synthesized audio cache (re-renders of edited documents only synthesize changed chunks)
+CHUNK_CACHE_DIR = Path(os.getenv("CHUNK_CACHE_DIR", "") or (DATA_DIR / "chunk_cache"))
+CHUNK_CACHE_MAX_MB = _env_int("CHUNK_CACHE_MAX_MB", 512, minimum=0)  # 0 disables the cache
@@ -1,9 +1,19 @@
 # app/main.py
+# Keep this import graph light: it is paid on every cold start / scale-out.
+# Heavy deps (TTS/torch, readability/bs4/lxml, langdetect) load on first use or in
+# the optional background preload below. `python -m app.tools.import_profile --check`
+# guards this (see that module for the budget).
+import logging
+import threading
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from .config.settings import PRELOAD_ON_STARTUP
 from .routers.voice import router as voice_router
 
+logger = logging.getLogger("cognomegafx.main")
+
 app = FastAPI(title="Cognomegafx API", version="0.3.0-max")
 
 app.add_middleware(
@@ -20,11 +30,30 @@ def health():
 
 # Mount optional content router (only if present)
 try:
-    from .routers import content as content_router  # lazy import so missing module won't break startup
+    from .routers import content as content_router
+except ModuleNotFoundError as e:
+    # only a missing content router module is fine; anything else is a real bug and must surface
+    if e.name != f"{__package__}.routers.content":
+        raise
+    logger.warning("content router not available: %s", e)
+else:
     app.include_router(content_router.router, prefix="/api/v1/content", tags=["content"])
-except Exception:
-    # It's fine if content router doesn't exist (or has import-time issues)
-    pass
 
 # Voice routes
 app.include_router(voice_router, prefix="/api/v1/voice", tags=["voice"])
+
+def _preload() -> None:
+    from .services import html_cleaner, tts_engine
+
+    for name, fn in (("tts", tts_engine.preload), ("html_cleaner", html_cleaner.preload)):
+        try:
+            fn()
+            logger.info("preload %s ok", name)
+        except Exception as e:
+            logger.warning("preload %s failed (will load on first use): %s", name, e)
+
+@app.on_event("startup")
+def _start_background_preload():
+    # serve /health immediately; warm models/parsers off the startup path
+    if PRELOAD_ON_STARTUP:
+        threading.Thread(target=_preload, name="preload", daemon=True).start()
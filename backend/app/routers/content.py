@@ -1,5 +1,5 @@
 # app/routers/content.py
-from fastapi import APIRouter, UploadFile, File, Form
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from pydantic import BaseModel
 from ..services.html_cleaner import clean_html_main
 
@@ -8,12 +8,19 @@ router = APIRouter()
 class CleanHtmlRequest(BaseModel):
     html: str
 
+def _clean(html: str) -> dict:
+    # parsers are imported lazily; a missing one only breaks these endpoints
+    try:
+        return clean_html_main(html)
+    except ImportError as e:
+        raise HTTPException(status_code=503, detail=f"HTML cleaning unavailable: {e}")
+
 @router.post("/clean_html")
 def clean_html(req: CleanHtmlRequest):
-    return clean_html_main(req.html)
+    return _clean(req.html)
 
 @router.post("/clean_html_file")
 async def clean_html_file(file: UploadFile = File(...)):
     raw = await file.read()
-    out = clean_html_main(raw.decode(errors="ignore"))
+    out = _clean(raw.decode(errors="ignore"))
     return out
@@ -1,7 +1,7 @@
 # app/routers/voice.py
 from __future__ import annotations
 
-import logging, uuid, traceback, tempfile, os
+import logging, uuid, traceback, tempfile, os, time, shutil
 from pathlib import Path
 from typing import List
 
@@ -9,17 +9,21 @@ from fastapi import APIRouter, UploadFile, File, HTTPException, Response, Reques
 from fastapi.responses import FileResponse, JSONResponse
 from pydantic import BaseModel
 
-from ..services.tts_engine import synthesize_to_wav
+from ..services.tts_engine import synthesize_to_wav, resolve_voice
 from ..services.stt_engine import transcribe_wav
 from ..utils.audio_tools import ensure_wav
+from ..utils.wav_tools import wav_duration
 from ..services.voices import list_voices
-from ..services import xtts_engine
+from ..services import xtts_engine, chunk_cache, metrics
+from ..services.engine_manager import manager as engine_manager
+from ..services.long_tts import render_long, effective_parallel
+from ..services.cancellation import CancelToken, SynthesisCancelled
 
 # Optional deps with safe fallbacks
 try:
     from ..services.text_chunker import chunk_text
 except Exception:
-    def chunk_text(text: str, max_chars: int = 500) -> List[str]:
+    def chunk_text(text: str, max_chars: int = 500, stable: bool = False) -> List[str]:
         text = (text or "").strip()
         if not text:
             return []
@@ -58,9 +62,8 @@ except Exception:
 logger = logging.getLogger("cognomegafx.voice")
 router = APIRouter()
 
-# Where we put generated files if we want a persistent output
+# Where we put generated files if we want a persistent output (engines create it on first write)
 DATA_DIR = Path(__file__).resolve().parents[2] / "backend" / "data"
-DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 class SpeakRequest(BaseModel):
     text: str
@@ -68,13 +71,52 @@ class SpeakRequest(BaseModel):
     cloned: bool | None = False     # relevant for XTTS
     voice: str | None = None        # "xtts_default" | "xtts_cloned" | "piper_default"
     language: str | None = None     # e.g. "en"
+    timeout_s: float | None = None  # give up after this long (also: X-Request-Timeout header)
 
 class SpeakLongRequest(BaseModel):
     text: str
+    engine: str | None = "auto"
     voice: str | None = None
     language: str | None = None
     auto_language: bool | None = True
     max_chars: int | None = 500
+    max_parallel: int | None = None  # capped by SPEAK_LONG_MAX_PARALLEL
+    use_cache: bool | None = True    # reuse cached audio for unchanged chunks
+    timeout_s: float | None = None   # give up after this long (also: X-Request-Timeout header)
+
+def _cancel_token(request: Request, timeout_s: float | None) -> CancelToken:
+    """
+    Deadline = the shorter of the body's timeout_s and the X-Request-Timeout header (seconds).
+    Disconnects are probed through the event loop; this works from the threadpool
+    that runs these sync handlers (anyio worker threads).
+    """
+    limits = []
+    for v in (timeout_s, request.headers.get("X-Request-Timeout")):
+        try:
+            if v is not None and float(v) > 0:
+                limits.append(float(v))
+        except ValueError:
+            pass
+    deadline = time.monotonic() + min(limits) if limits else None
+
+    def is_disconnected() -> bool:
+        import anyio.from_thread
+        return anyio.from_thread.run(request.is_disconnected)
+
+    return CancelToken(deadline=deadline, is_disconnected=is_disconnected)
+
+def _cancelled(rid: str, route: str, e: SynthesisCancelled) -> HTTPException:
+    metrics.incr(f"requests_cancelled_{e.reason}")
+    logger.info("[%s] %s cancelled: %s", rid, route, e.reason)
+    if e.reason == "deadline":
+        return HTTPException(status_code=504, detail=f"Deadline exceeded (request_id={rid}).")
+    # 499: client closed request (nobody is listening anyway)
+    return HTTPException(status_code=499, detail=f"Client disconnected (request_id={rid}).")
+
+def _rtf(elapsed: float, wav_path: str) -> float:
+    """Real-time factor: wall-clock synthesis time / audio duration (lower is faster)."""
+    dur = wav_duration(wav_path)
+    return elapsed / dur if dur > 0 else 0.0
 
 @router.get("/voices")
 def get_voices():
@@ -82,11 +124,17 @@ def get_voices():
 
 @router.get("/debug")
 def debug():
-    return {"xtts": xtts_engine.diagnostics()}
+    return {
+        "xtts": xtts_engine.diagnostics(),
+        "engines": engine_manager.stats(),
+        "chunk_cache": chunk_cache.stats(),
+        "metrics": metrics.snapshot(),
+    }
 
 @router.post("/speak", response_class=FileResponse)
 def speak(req: SpeakRequest, response: Response, request: Request):
     rid = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+    cancel = _cancel_token(request, req.timeout_s)
     try:
         text = (req.text or "").strip()
         if not text:
@@ -105,18 +153,22 @@ def speak(req: SpeakRequest, response: Response, request: Request):
         logger.info("[%s] /speak start engine=%s cloned=%s voice=%s lang=%s len=%s",
                     rid, use_engine, cloned, req.voice, req.language, len(text))
 
+        t0 = time.perf_counter()
         out_path, engine_used = synthesize_to_wav(
-            text, engine=use_engine, cloned=cloned, language=req.language
+            text, engine=use_engine, cloned=cloned, language=req.language,
+            cancel=cancel,
         )
-        response.headers["X-TTS-Engine"] = engine_used
-        response.headers["X-Request-ID"] = rid
+        rtf = _rtf(time.perf_counter() - t0, out_path)
+        headers = {"X-TTS-Engine": engine_used, "X-TTS-RTF": f"{rtf:.4f}", "X-Request-ID": rid}
 
-        logger.info("[%s] /speak ok engine=%s file=%s", rid, engine_used, out_path)
-        return FileResponse(out_path, media_type="audio/wav", filename="speech.wav")
+        logger.info("[%s] /speak ok engine=%s rtf=%.3f file=%s", rid, engine_used, rtf, out_path)
+        return FileResponse(out_path, media_type="audio/wav", filename="speech.wav", headers=headers)
 
     except HTTPException:
         logger.warning("[%s] /speak 4xx:\n%s", rid, traceback.format_exc())
         raise
+    except SynthesisCancelled as e:
+        raise _cancelled(rid, "/speak", e)
     except Exception as e:
         logger.exception("[%s] /speak 5xx: %s", rid, e)
         raise HTTPException(status_code=500, detail=f"TTS error (request_id={rid}). Check backend logs.")
@@ -124,50 +176,59 @@ def speak(req: SpeakRequest, response: Response, request: Request):
 @router.post("/speak_long", response_class=FileResponse)
 def speak_long(req: SpeakLongRequest, response: Response, request: Request):
     rid = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+    cancel = _cancel_token(request, req.timeout_s)
+    tmpdir = None
     try:
         text = (req.text or "").strip()
         if not text:
             raise HTTPException(status_code=400, detail="Text is empty.")
 
-        if req.voice == "xtts_default":
-            use_engine, cloned = "xtts", False
-        elif req.voice == "xtts_cloned":
-            use_engine, cloned = "xtts", True
-        elif req.voice == "piper_default":
-            use_engine, cloned = "piper", False
-        else:
-            use_engine, cloned = req.engine or "auto", False
+        use_engine, cloned = resolve_voice(req.voice, req.engine)
 
         max_chars = int(req.max_chars or 500)
-        parts_in = chunk_text(text, max_chars=max_chars)
+        use_cache = req.use_cache is not False
+        # stable boundaries keep unchanged chunks (and their cache keys) identical across edits
+        parts_in = chunk_text(text, max_chars=max_chars, stable=use_cache)
         if not parts_in:
             raise HTTPException(status_code=400, detail="No chunks to synthesize.")
 
-        logger.info("[%s] /speak_long start engine=%s cloned=%s voice=%s lang=%s chunks=%d",
-                    rid, use_engine, cloned, req.voice, req.language, len(parts_in))
+        parallel = effective_parallel(len(parts_in), req.max_parallel)
+        logger.info("[%s] /speak_long start engine=%s cloned=%s voice=%s lang=%s chunks=%d parallel=%d",
+                    rid, use_engine, cloned, req.voice, req.language, len(parts_in), parallel)
 
+        t0 = time.perf_counter()
         tmpdir = tempfile.mkdtemp(prefix="long_tts_")
-        part_paths: List[str] = []
-        engine_used = use_engine
-        for i, part in enumerate(parts_in, 1):
-            out_path, engine_used = synthesize_to_wav(
-                part, engine=use_engine, cloned=cloned, language=req.language
-            )
-            new_path = os.path.join(tmpdir, f"part_{i:04d}.wav")
-            os.replace(out_path, new_path)
-            part_paths.append(new_path)
-
         final_path = os.path.join(tmpdir, "speech_full.wav")
-        concat_wavs(part_paths, final_path)
-
-        response.headers["X-TTS-Engine"] = engine_used
-        response.headers["X-Request-ID"] = rid
-        logger.info("[%s] /speak_long ok engine=%s file=%s", rid, engine_used, final_path)
-        return FileResponse(final_path, media_type="audio/wav", filename="speech.wav")
+        engine_used, cache_hits = render_long(
+            parts_in, final_path, tmpdir,
+            engine=use_engine, cloned=cloned, language=req.language,
+            max_parallel=parallel, use_cache=use_cache,
+            cancel=cancel,
+        )
+        rtf = _rtf(time.perf_counter() - t0, final_path)
+
+        # FastAPI drops headers set on `response` when we return our own Response,
+        # so pass them to the FileResponse explicitly
+        headers = {
+            "X-TTS-Engine": engine_used,
+            "X-TTS-Parallel": str(parallel),
+            "X-TTS-Chunks": str(len(parts_in)),
+            "X-TTS-Cache-Hits": str(cache_hits),
+            "X-TTS-Cache-Hit-Ratio": f"{cache_hits / len(parts_in):.3f}",
+            "X-TTS-RTF": f"{rtf:.4f}",
+            "X-Request-ID": rid,
+        }
+        logger.info("[%s] /speak_long ok engine=%s cache_hits=%d/%d rtf=%.3f file=%s",
+                    rid, engine_used, cache_hits, len(parts_in), rtf, final_path)
+        return FileResponse(final_path, media_type="audio/wav", filename="speech.wav", headers=headers)
 
     except HTTPException:
         logger.warning("[%s] /speak_long 4xx:\n%s", rid, traceback.format_exc())
         raise
+    except SynthesisCancelled as e:
+        if tmpdir:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+        raise _cancelled(rid, "/speak_long", e)
     except Exception as e:
         logger.exception("[%s] /speak_long 5xx: %s", rid, e)
         raise HTTPException(status_code=500, detail=f"TTS long error (request_id={rid}). Check backend logs.")
@@ -0,0 +1,93 @@
+# app/services/cancellation.py
+"""
+Cooperative cancellation for synthesis work.
+- A CancelToken trips on an explicit cancel(), an expired deadline, or a
+  disconnect probe reporting that the client went away
+- Work checks it between chunks (and in engines where possible) and raises
+  SynthesisCancelled; nothing is interrupted preemptively
+- The probe is polled at most every POLL_INTERVAL seconds, and only from the
+  thread that created the token (e.g. the request handler): worker threads
+  cannot reach the event loop, so they only see the result. A failing probe
+  counts as "still connected" and is retried on the next check
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Optional
+
+POLL_INTERVAL = 0.5
+
+class SynthesisCancelled(RuntimeError):
+    def __init__(self, reason: str):
+        self.reason = reason
+        super().__init__(f"Synthesis cancelled ({reason})")
+
+class CancelToken:
+    def __init__(
+        self,
+        deadline: Optional[float] = None,
+        is_disconnected: Optional[Callable[[], bool]] = None,
+    ):
+        self.deadline = deadline  # time.monotonic() value
+        self._is_disconnected = is_disconnected
+        self._reason: Optional[str] = None
+        self._last_poll = 0.0
+        self._lock = threading.Lock()
+        self._poll_lock = threading.Lock()  # separate so a slow probe never blocks cancel()
+        self._owner = threading.get_ident()
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._reason
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        with self._lock:
+            if self._reason is None:
+                self._reason = reason
+
+    def cancelled(self) -> bool:
+        if self._reason is not None:
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel("deadline")
+            return True
+        if self._is_disconnected is not None and threading.get_ident() == self._owner:
+            self._poll()
+        return self._reason is not None
+
+    def _poll(self) -> None:
+        if not self._poll_lock.acquire(blocking=False):
+            return  # a probe is already in flight
+        try:
+            now = time.monotonic()
+            if now - self._last_poll < POLL_INTERVAL:
+                return
+            try:
+                gone = self._is_disconnected()
+            except Exception:
+                return  # don't count a failed probe as a poll
+            self._last_poll = now
+            if gone:
+                self.cancel("disconnect")
+        finally:
+            self._poll_lock.release()
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled():
+            raise SynthesisCancelled(self._reason or "cancelled")
+
+    def sleep(self, seconds: float) -> None:
+        """time.sleep that wakes up early (raising SynthesisCancelled) on cancellation."""
+        end = time.monotonic() + seconds
+        while True:
+            self.raise_if_cancelled()
+            left = end - time.monotonic()
+            if left <= 0:
+                return
+            time.sleep(min(left, POLL_INTERVAL / 2))
+
+def check(cancel: Optional[CancelToken]) -> None:
+    """raise_if_cancelled for optional tokens."""
+    if cancel is not None:
+        cancel.raise_if_cancelled()
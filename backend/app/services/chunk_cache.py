@@ -0,0 +1,150 @@
+# app/services/chunk_cache.py
+"""
+On-disk cache of synthesized chunk audio.
+- Key: sha256 over the chunk text + voice identity (engine/model/voice/language)
+- Entries are plain WAV files under CHUNK_CACHE_DIR, written atomically
+- Size-capped (CHUNK_CACHE_MAX_MB); least-recently-used entries are evicted.
+  The total is tracked in memory (one directory scan on first use), so a store
+  only rescans the cache when it pushes the total over the cap; eviction then
+  trims to _LOW_WATER of the cap so the next few stores don't rescan again
+- CHUNK_CACHE_MAX_MB=0 disables the cache
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from ..config.settings import CHUNK_CACHE_DIR, CHUNK_CACHE_MAX_MB
+
+logger = logging.getLogger("cognomegafx.chunk_cache")
+
+_LOCK = threading.Lock()
+_LOW_WATER = 0.9
+_total: Optional[int] = None  # bytes under CHUNK_CACHE_DIR; None until first scanned
+
+def enabled() -> bool:
+    return CHUNK_CACHE_MAX_MB > 0
+
+def cache_key(text: str, identity: dict) -> str:
+    payload = json.dumps({"text": text, "voice": identity}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _entry_path(key: str) -> Path:
+    return Path(CHUNK_CACHE_DIR) / key[:2] / f"{key}.wav"
+
+def _link_or_copy(src: str, dst: str) -> None:
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+def fetch(key: str, dst: str) -> bool:
+    """
+    Place the cached audio for `key` at `dst`. Returns False on a miss.
+    `dst` gets its own link/copy, so a concurrent eviction can't pull it away.
+    """
+    if not enabled():
+        return False
+    src = _entry_path(key)
+    try:
+        _link_or_copy(str(src), dst)
+    except OSError:
+        return False
+    try:
+        os.utime(src)  # recency for LRU eviction
+    except OSError:
+        pass
+    return True
+
+def store(key: str, wav_path: str) -> None:
+    """
+    Add `wav_path` to the cache (atomic: copy to a temp name, then rename).
+    Cache failures are logged, never raised: synthesis already succeeded.
+    """
+    if not enabled():
+        return
+    dst = _entry_path(key)
+    tmp = dst.with_name(f".{dst.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        _link_or_copy(wav_path, str(tmp))
+        added = os.path.getsize(tmp)
+        try:
+            added -= os.path.getsize(dst)  # overwriting an existing entry
+        except OSError:
+            pass
+        os.replace(tmp, dst)
+    except OSError as e:
+        logger.warning("chunk cache store failed key=%s: %s", key, e)
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return
+    _account(added)
+
+def _scan() -> Tuple[int, List[Tuple[float, int, Path]]]:
+    entries = []
+    total = 0
+    for p in Path(CHUNK_CACHE_DIR).glob("*/*.wav"):
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, p))
+        total += st.st_size
+    return total, entries
+
+def _account(added: int) -> None:
+    """Add a store to the running total; evict LRU entries only once it exceeds the cap."""
+    global _total
+    budget = CHUNK_CACHE_MAX_MB * 1024 * 1024
+    with _LOCK:
+        if _total is None:
+            _total = _scan()[0]  # already includes this entry
+        else:
+            _total += added
+        if _total <= budget:
+            return
+        # exact sizes and recency (the total may have drifted, e.g. entries removed by hand)
+        total, entries = _scan()
+        entries.sort()
+        target = int(budget * _LOW_WATER)
+        evicted = 0
+        for _, size, p in entries:
+            if total <= target:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+        _total = total
+        if evicted:
+            logger.info("chunk cache evicted %d entries (now %.1f MB)", evicted, total / (1024 * 1024))
+
+def stats() -> dict:
+    files = 0
+    size = 0
+    if enabled():
+        for p in Path(CHUNK_CACHE_DIR).glob("*/*.wav"):
+            try:
+                size += p.stat().st_size
+                files += 1
+            except OSError:
+                continue
+    return {
+        "enabled": enabled(),
+        "dir": str(CHUNK_CACHE_DIR),
+        "max_mb": CHUNK_CACHE_MAX_MB,
+        "entries": files,
+        "size_mb": round(size / (1024 * 1024), 2),
+    }
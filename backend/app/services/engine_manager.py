@@ -0,0 +1,292 @@
+# app/services/engine_manager.py
+"""
+Keeps TTS models resident under a memory budget.
+- Engines register a loader per model key (e.g. one key per XTTS replica of
+  each fine-tune); models are loaded on first use
+- Each loaded model serves one caller at a time (acquire/release)
+- Footprint = process RSS growth measured around the load. Loads (and unloads)
+  are serialized so concurrent loads don't count each other's memory, and an
+  optional `prepare` hook imports the engine library before the baseline is taken
+- Over ENGINE_MEMORY_BUDGET_MB, least-recently-used idle models are evicted
+- Models idle for ENGINE_IDLE_UNLOAD_S are unloaded by a background reaper
+"""
+from __future__ import annotations
+
+import gc
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from ..config.settings import ENGINE_IDLE_UNLOAD_S, ENGINE_MEMORY_BUDGET_MB
+from .cancellation import CancelToken, check
+
+logger = logging.getLogger("cognomegafx.engines")
+
+_MB = 1024 * 1024
+
+def _rss_bytes() -> int:
+    """Current process RSS; psutil if installed, else /proc (Linux), else 0."""
+    try:
+        import psutil
+        return int(psutil.Process().memory_info().rss)
+    except Exception:
+        pass
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        return 0
+
+def _release_memory() -> None:
+    gc.collect()
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except Exception:
+        pass
+
+class _Entry:
+    def __init__(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        unloader: Optional[Callable[[Any], None]],
+        prepare: Optional[Callable[[], None]],
+    ):
+        self.key = key
+        self.loader = loader
+        self.prepare = prepare
+        self.unloader = unloader
+        self.model: Any = None
+        self.loading = False
+        self.in_use = False
+        self.footprint = 0      # bytes, from the last load
+        self.last_used = 0.0    # time.monotonic()
+        self.loads = 0
+
+class EngineManager:
+    def __init__(self, budget_mb: int = 0, idle_unload_s: int = 0):
+        self.budget = budget_mb * _MB
+        self.idle_unload_s = idle_unload_s
+        self._entries: Dict[str, _Entry] = {}
+        self._cond = threading.Condition()
+        # held while RSS is measured around a load and while models are freed,
+        # so one footprint never includes another model's (de)allocation
+        self._load_lock = threading.RLock()
+        self._reaper: Optional[threading.Thread] = None
+        self.counters = {"loads": 0, "load_failures": 0, "evictions": 0, "idle_unloads": 0}
+
+    # -- registration ------------------------------------------------------
+
+    def register(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        unloader: Optional[Callable[[Any], None]] = None,
+        prepare: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Idempotent: re-registering a known key keeps its loaded model.
+        `prepare` runs before the RSS baseline of every load (e.g. import the engine
+        library), so one-off import cost isn't charged to the first model.
+        """
+        with self._cond:
+            if key not in self._entries:
+                self._entries[key] = _Entry(key, loader, unloader, prepare)
+
+    # -- use -----------------------------------------------------------------
+
+    @contextmanager
+    def acquire(self, keys: Sequence[str], cancel: Optional[CancelToken] = None) -> Iterator[Any]:
+        """
+        Borrow exclusive use of one model among `keys` (interchangeable replicas):
+        an idle loaded one if any, else load one that isn't resident yet,
+        else wait for one to be released (giving up if `cancel` trips).
+        """
+        entry, must_load = self._claim(keys, cancel)
+        if must_load:
+            self._load(entry)
+        try:
+            yield entry.model
+        finally:
+            with self._cond:
+                entry.in_use = False
+                entry.last_used = time.monotonic()
+                self._cond.notify_all()
+
+    def _claim(self, keys: Sequence[str], cancel: Optional[CancelToken]):
+        with self._cond:
+            entries = [self._entries[k] for k in keys]
+            while True:
+                check(cancel)
+                for e in entries:
+                    if e.model is not None and not e.in_use:
+                        e.in_use = True
+                        return e, False
+                for e in entries:
+                    if e.model is None and not e.loading:
+                        e.loading = True
+                        e.in_use = True
+                        return e, True
+                self._cond.wait(0.25)
+
+    def _load(self, entry: _Entry) -> None:
+        t0 = time.perf_counter()
+        try:
+            with self._load_lock:
+                # make room using the footprint seen last time (unknown on first load)
+                self._evict_until_fits(entry)
+                if entry.prepare is not None:
+                    entry.prepare()
+                rss0 = _rss_bytes()
+                model = entry.loader()
+                grown = max(0, _rss_bytes() - rss0)
+        except BaseException:
+            with self._cond:
+                entry.loading = False
+                entry.in_use = False
+                self.counters["load_failures"] += 1
+                self._cond.notify_all()
+            raise
+        with self._cond:
+            entry.model = model
+            entry.loading = False
+            entry.footprint = grown or entry.footprint
+            entry.loads += 1
+            entry.last_used = time.monotonic()
+            self.counters["loads"] += 1
+        logger.info("engine loaded key=%s footprint=%.0fMB in %.1fs resident=%.0fMB",
+                    entry.key, entry.footprint / _MB, time.perf_counter() - t0, self.resident_bytes() / _MB)
+        self._evict_until_fits(entry)
+        self._ensure_reaper()
+
+    # -- eviction ------------------------------------------------------------
+
+    def resident_bytes(self) -> int:
+        with self._cond:
+            return sum(e.footprint for e in self._entries.values() if e.model is not None or e.loading)
+
+    def _evict_until_fits(self, entry: _Entry) -> None:
+        """Evict LRU idle models until the others plus `entry` fit the budget."""
+        if not self.budget:
+            return
+        while True:
+            with self._cond:
+                others = sum(e.footprint for e in self._entries.values()
+                             if e is not entry and (e.model is not None or e.loading))
+                if others + entry.footprint <= self.budget:
+                    return
+                idle = [e for e in self._entries.values()
+                        if e is not entry and e.model is not None and not e.in_use]
+                if not idle:
+                    logger.warning("engine memory budget %.0fMB exceeded; nothing idle to evict",
+                                   self.budget / _MB)
+                    return
+                victim = min(idle, key=lambda e: e.last_used)
+                model = self._detach(victim)
+                self.counters["evictions"] += 1
+            logger.info("engine evicted (LRU, over budget) key=%s", victim.key)
+            with self._load_lock:
+                self._run_unloader(victim, model)
+                del model
+                _release_memory()
+
+    def _detach(self, entry: _Entry) -> Any:
+        # caller holds the lock
+        model, entry.model = entry.model, None
+        return model
+
+    def _run_unloader(self, entry: _Entry, model: Any) -> None:
+        # callers drop their reference afterwards, then _release_memory()
+        try:
+            if entry.unloader is not None:
+                entry.unloader(model)
+        except Exception as e:
+            logger.warning("engine unloader failed key=%s: %s", entry.key, e)
+
+    def unload(self, key: str) -> bool:
+        with self._cond:
+            e = self._entries.get(key)
+            if e is None or e.model is None or e.in_use:
+                return False
+            model = self._detach(e)
+        with self._load_lock:
+            self._run_unloader(e, model)
+            del model
+            _release_memory()
+        return True
+
+    def reap_idle(self) -> int:
+        """Unload models idle for longer than idle_unload_s. Returns how many."""
+        if not self.idle_unload_s:
+            return 0
+        now = time.monotonic()
+        victims = []
+        with self._cond:
+            for e in self._entries.values():
+                if e.model is not None and not e.in_use and now - e.last_used >= self.idle_unload_s:
+                    victims.append((e, self._detach(e)))
+            self.counters["idle_unloads"] += len(victims)
+        n = len(victims)
+        if not n:
+            return 0
+        with self._load_lock:
+            for e, model in victims:
+                logger.info("engine unloaded (idle %ds) key=%s", self.idle_unload_s, e.key)
+                self._run_unloader(e, model)
+            victims.clear()
+            model = None  # drop the loop's last reference before collecting
+            _release_memory()
+        return n
+
+    def _ensure_reaper(self) -> None:
+        if not self.idle_unload_s or self._reaper is not None:
+            return
+        with self._cond:
+            if self._reaper is not None:
+                return
+            interval = max(1.0, min(60.0, self.idle_unload_s / 2))
+
+            def loop() -> None:
+                while True:
+                    time.sleep(interval)
+                    try:
+                        self.reap_idle()
+                    except Exception:
+                        logger.exception("engine idle reaper failed")
+
+            self._reaper = threading.Thread(target=loop, name="engine-reaper", daemon=True)
+            self._reaper.start()
+
+    # -- reporting -----------------------------------------------------------
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._cond:
+            models: List[dict] = []
+            for e in self._entries.values():
+                models.append({
+                    "key": e.key,
+                    "resident": e.model is not None,
+                    "loading": e.loading,
+                    "in_use": e.in_use,
+                    "footprint_mb": round(e.footprint / _MB, 1),
+                    "idle_s": round(now - e.last_used, 1) if e.last_used and not e.in_use else 0.0,
+                    "loads": e.loads,
+                })
+            resident = sum(e.footprint for e in self._entries.values() if e.model is not None)
+            return {
+                "budget_mb": self.budget // _MB,
+                "idle_unload_s": self.idle_unload_s,
+                "resident_mb": round(resident / _MB, 1),
+                "process_rss_mb": round(_rss_bytes() / _MB, 1),
+                "counters": dict(self.counters),
+                "models": models,
+            }
+
+# process-wide instance used by the engines
+manager = EngineManager(ENGINE_MEMORY_BUDGET_MB, ENGINE_IDLE_UNLOAD_S)
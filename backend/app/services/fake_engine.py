@@ -0,0 +1,77 @@
+# app/services/fake_engine.py
+"""
+Fixed-RTF stand-in for a real TTS model, used for load testing the HTTP stack.
+- Audio length is estimated from the text (~15 chars per second of speech)
+- Sleeps TTS_FAKE_RTF * audio_seconds while holding one of XTTS_REPLICAS fake
+  "models" from the engine manager, so requests queue on replicas and latency
+  collapses past saturation the way it does with the real engine
+- Writes a quiet 220 Hz tone (16-bit mono 22.05kHz) so the output is a valid WAV
+"""
+from __future__ import annotations
+
+import math
+import struct
+import time
+import uuid
+import wave
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+from ..config.settings import DATA_DIR, TTS_FAKE_RTF, XTTS_REPLICAS
+from .cancellation import CancelToken
+from .engine_manager import manager
+
+FAKE_SAMPLE_RATE = 22050
+_CHARS_PER_SECOND = 15.0
+
+def estimated_seconds(text: str) -> float:
+    return max(0.3, len(text) / _CHARS_PER_SECOND)
+
+@lru_cache(maxsize=1)
+def _tone_second() -> bytes:
+    # one second of the tone (a whole number of 220 Hz cycles), tiled to any length so
+    # writing the WAV costs a memcpy rather than a per-sample loop under the GIL;
+    # built on first use, not at import (this module is on app.main's import path)
+    return struct.pack(
+        f"<{FAKE_SAMPLE_RATE}h",
+        *(int(2000 * math.sin(2 * math.pi * 220 * i / FAKE_SAMPLE_RATE)) for i in range(FAKE_SAMPLE_RATE)),
+    )
+
+def _tone(seconds: float) -> bytes:
+    second = _tone_second()
+    n = int(seconds * FAKE_SAMPLE_RATE) * 2
+    reps = -(-n // len(second))
+    return (second * reps)[:n]
+
+def _replica_keys() -> List[str]:
+    keys = [f"fake#{i}" for i in range(XTTS_REPLICAS)]
+    for k in keys:
+        manager.register(k, lambda k=k: k)  # nothing to load; the key is the "model"
+    return keys
+
+def synthesize_fake(text: str, cancel: Optional[CancelToken] = None) -> str:
+    """
+    Returns absolute path to a generated wav file.
+    The simulated inference honours `cancel` mid-way, like a streaming model would.
+    """
+    text = (text or "").strip()
+    if not text:
+        raise ValueError("Empty text.")
+
+    seconds = estimated_seconds(text)
+    delay = seconds * max(0.0, TTS_FAKE_RTF)
+    with manager.acquire(_replica_keys(), cancel=cancel):
+        if cancel is not None:
+            cancel.sleep(delay)
+        else:
+            time.sleep(delay)
+
+    Path(DATA_DIR).mkdir(parents=True, exist_ok=True)
+    out_path = str(Path(DATA_DIR) / f"fake_{uuid.uuid4().hex}.wav")
+    with wave.open(out_path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(FAKE_SAMPLE_RATE)
+        w.writeframes(_tone(seconds))
+    return out_path
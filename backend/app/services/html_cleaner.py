@@ -1,11 +1,18 @@
 # app/services/html_cleaner.py
-from bs4 import BeautifulSoup
-from readability import Document
+# readability / BeautifulSoup / lxml are imported on first use (or by preload())
+# so that importing the app stays cheap.
+
+def preload() -> None:
+    """Import the parsing stack ahead of the first request (background startup preload)."""
+    import bs4, readability, lxml  # noqa: F401
 
 def clean_html_main(html: str) -> dict:
     """
     Return best-effort title + main text from noisy HTML.
     """
+    from bs4 import BeautifulSoup
+    from readability import Document
+
     # 1) Run Readability to isolate main article-ish content
     doc = Document(html)
     title = (doc.short_title() or "").strip()
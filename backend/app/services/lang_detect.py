@@ -1,8 +1,13 @@
 # app/services/lang_detect.py
-from langdetect import detect, DetectorFactory
+# langdetect (profile loading) and `regex` are imported on first use.
+from functools import lru_cache
 
-# Make langdetect deterministic
-DetectorFactory.seed = 42
+@lru_cache(maxsize=1)
+def _detect():
+    from langdetect import detect, DetectorFactory
+    # Make langdetect deterministic
+    DetectorFactory.seed = 42
+    return detect
 
 # Map langdetect codes -> XTTS codes where they differ or we want to limit set
 LANG_MAP = {
@@ -27,7 +32,7 @@ LANG_MAP = {
 
 def detect_lang(text: str, fallback: str = "en") -> str:
     try:
-        raw = detect(text)
+        raw = _detect()(text)
         # normalize special cases
         raw = raw.lower()
         if raw in LANG_MAP:
@@ -38,17 +43,17 @@ def detect_lang(text: str, fallback: str = "en") -> str:
     except Exception:
         return fallback
 
-# add at bottom of file
-import regex as re
-
-DEVANAGARI = re.compile(r"\p{Script=Devanagari}")
+@lru_cache(maxsize=1)
+def _devanagari():
+    import regex
+    return regex.compile(r"\p{Script=Devanagari}")
 
 def guess_lang_by_script(text: str, fallback: str = "en") -> str:
     # if at least 30% chars are Devanagari, call it Hindi
     if not text:
         return fallback
     total = len(text)
-    dev = len(DEVANAGARI.findall(text))
+    dev = len(_devanagari().findall(text))
     if total and (dev / total) >= 0.30:
         return "hi"
     return fallback
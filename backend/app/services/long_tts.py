@@ -0,0 +1,162 @@
+# app/services/long_tts.py
+"""
+Long-form rendering shared by /speak_long and any batch/job runner:
+- Chunks fan out over a shared pool sized to the number of engine replicas
+- Each request is capped at `max_parallel` chunks in flight (SPEAK_LONG_MAX_PARALLEL)
+- Parts are reassembled in order; head-of-line parts are appended to the output
+  as soon as they are ready instead of waiting for the whole document
+- Chunks already in the chunk cache are spliced in without synthesis
+- An optional CancelToken is checked between chunks and while waiting; on
+  cancellation queued chunks are dropped and in-flight results are discarded
+  (but still cached, so a retry does not redo them)
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Deque, List, Optional, Tuple
+
+from ..config.settings import SPEAK_LONG_MAX_PARALLEL, XTTS_REPLICAS
+from ..utils.wav_tools import WavAppender
+from . import chunk_cache, metrics
+from .cancellation import CancelToken, SynthesisCancelled, check
+from .tts_engine import synthesize_to_wav, voice_identity
+
+logger = logging.getLogger("cognomegafx.long_tts")
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=XTTS_REPLICAS, thread_name_prefix="tts-chunk")
+        return _EXECUTOR
+
+def effective_parallel(n_parts: int, max_parallel: Optional[int] = None) -> int:
+    """
+    Chunks one request may have in flight: never more than the per-request cap,
+    the replica count, or the number of chunks.
+    """
+    cap = SPEAK_LONG_MAX_PARALLEL
+    if max_parallel:
+        cap = min(cap, int(max_parallel))
+    return max(1, min(cap, XTTS_REPLICAS, n_parts))
+
+def _part_path(workdir: str, idx: int) -> str:
+    return os.path.join(workdir, f"part_{idx:04d}.wav")
+
+def _render_part(
+    idx: int,
+    part: str,
+    workdir: str,
+    engine: Optional[str],
+    cloned: bool,
+    language: Optional[str],
+    key: Optional[str],
+    cancel: Optional[CancelToken],
+) -> Tuple[str, str]:
+    check(cancel)
+    try:
+        out_path, engine_used = synthesize_to_wav(part, engine=engine, cloned=cloned, language=language,
+                                                  cancel=cancel)
+    except SynthesisCancelled:
+        metrics.incr("chunks_aborted")  # stopped mid-synthesis
+        raise
+    if key:
+        chunk_cache.store(key, out_path)
+    if cancel is not None and cancel.cancelled():
+        # nobody will read this part (the request's workdir may already be gone)
+        os.remove(out_path)
+        metrics.incr("chunks_discarded")
+        raise SynthesisCancelled(cancel.reason or "cancelled")
+    new_path = _part_path(workdir, idx)
+    try:
+        os.replace(out_path, new_path)
+    except OSError:
+        # cancelled between the check above and here: the handler removed workdir
+        try:
+            os.remove(out_path)
+        except OSError:
+            pass
+        if cancel is not None and cancel.cancelled():
+            metrics.incr("chunks_discarded")
+            raise SynthesisCancelled(cancel.reason or "cancelled")
+        raise
+    return new_path, engine_used
+
+def render_long(
+    parts: List[str],
+    out_path: str,
+    workdir: str,
+    engine: Optional[str] = "auto",
+    cloned: bool = False,
+    language: Optional[str] = None,
+    max_parallel: Optional[int] = None,
+    use_cache: bool = True,
+    cancel: Optional[CancelToken] = None,
+) -> Tuple[str, int]:
+    """
+    Synthesize `parts` (already chunked) into a single WAV at `out_path`.
+    Per-part files are kept in `workdir`. Returns (engine_used, cache_hits).
+    On failure, chunks not yet started are cancelled and the partial output is removed;
+    a tripped `cancel` raises SynthesisCancelled.
+    """
+    if not parts:
+        raise ValueError("No chunks to synthesize.")
+
+    window = effective_parallel(len(parts), max_parallel)
+    slots = threading.BoundedSemaphore(window)
+    pool = _executor()
+    pending: Deque[Future] = deque()
+    engine_used = engine or "auto"
+    identity = None
+    if use_cache and chunk_cache.enabled():
+        identity = voice_identity(engine, cloned=cloned, language=language)
+        engine_used = identity["engine"]
+    hits = 0
+    submitted = 0  # parts handed to the pool or served from cache
+
+    def drain(block: bool) -> None:
+        nonlocal engine_used
+        while pending and (block or pending[0].done()):
+            while not pending[0].done():
+                check(cancel)
+                wait([pending[0]], timeout=0.25)
+            part_path, engine_used = pending.popleft().result()
+            writer.append(part_path)
+
+    logger.info("render_long chunks=%d parallel=%d cache=%s", len(parts), window, identity is not None)
+    try:
+        with WavAppender(out_path) as writer:
+            for i, part in enumerate(parts, 1):
+                check(cancel)
+                key = chunk_cache.cache_key(part, identity) if identity else None
+                if key and chunk_cache.fetch(key, _part_path(workdir, i)):
+                    hits += 1
+                    submitted = i
+                    done: Future = Future()
+                    done.set_result((_part_path(workdir, i), identity["engine"]))
+                    pending.append(done)
+                    drain(block=False)
+                    continue
+                while not slots.acquire(timeout=0.25):
+                    check(cancel)
+                fut = pool.submit(_render_part, i, part, workdir, engine, cloned, language, key, cancel)
+                fut.add_done_callback(lambda _f: slots.release())
+                submitted = i
+                pending.append(fut)
+                drain(block=False)
+            drain(block=True)
+    except BaseException as e:
+        if cancel is not None and not isinstance(e, SynthesisCancelled):
+            cancel.cancel("error")  # let in-flight chunks bail out early
+        dropped = sum(1 for fut in pending if fut.cancel())
+        if isinstance(e, SynthesisCancelled):
+            metrics.incr("chunks_cancelled", dropped + len(parts) - submitted)  # never started
+        raise
+    return engine_used, hits
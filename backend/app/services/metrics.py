@@ -0,0 +1,22 @@
+# app/services/metrics.py
+"""
+Process-local counters (exposed via /api/v1/voice/debug).
+Cheap and dependency-free; swap for a Prometheus client if/when we need scraping.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Dict
+
+_LOCK = threading.Lock()
+_COUNTERS: Dict[str, int] = {}
+
+def incr(name: str, n: int = 1) -> None:
+    if not n:
+        return
+    with _LOCK:
+        _COUNTERS[name] = _COUNTERS.get(name, 0) + n
+
+def snapshot() -> Dict[str, int]:
+    with _LOCK:
+        return dict(sorted(_COUNTERS.items()))
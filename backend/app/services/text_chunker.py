@@ -6,9 +6,12 @@ Robust sentence-ish chunker:
   * Fallback splitting for ultra-long sentences (no punctuation)
   * Hard slicing if still too long
   * Bounds + whitespace normalization
+  * Optional stable mode: boundaries anchored to paragraphs and content-defined
+    sentence anchors, so a local edit only changes the chunks around it
 """
 from __future__ import annotations
 import re
+import zlib
 from typing import List
 
 # Original heuristic: split after . ! ? when followed by an uppercase/digit
@@ -18,6 +21,18 @@ _SENT_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9])")
 # Additional, softer boundaries used only for very long sentences
 _SOFT_BREAK_RE = re.compile(r"\s*([,;:\u3001\u3002])\s*")  # commas/semicolons + CJK punctuation
 
+# Paragraph break: blank line only. Single newlines are often hard wraps
+# (plain-text books, emails, pasted PDFs) and fall inside sentences.
+_PARA_RE = re.compile(r"\n\s*\n")
+
+# A chunk may only close early after a sentence that really ends here
+_TERMINAL_RE = re.compile(r"[.!?\u3002\uff01\uff1f][\"'\u201d\u2019)\]]*$")
+
+# Stable mode: a sentence whose hash hits this modulus may close a chunk early.
+# Depends only on the sentence text, so old and new versions of a document cut at
+# the same places once they are past an edit.
+_ANCHOR_MOD = 4
+
 def _normalize_ws(s: str) -> str:
     return re.sub(r"\s+", " ", s).strip()
 
@@ -131,8 +146,46 @@ def pack_chunks(sentences: List[str], max_chars: int = 500) -> List[str]:
         chunks.append(cur)
     return chunks
 
-def chunk_text(text: str, max_chars: int = 500) -> List[str]:
+def _is_anchor(sentence: str) -> bool:
+    return zlib.crc32(sentence.encode("utf-8")) % _ANCHOR_MOD == 0
+
+def pack_chunks_stable(paragraphs: List[List[str]], max_chars: int = 500) -> List[str]:
+    """
+    Like pack_chunks, but a chunk is also closed (once it holds at least a third
+    of max_chars) at the end of a paragraph or after an anchor sentence, as long
+    as the last sentence ends in terminal punctuation.
+    Boundaries depend only on nearby text, so re-chunking an edited document
+    reproduces the chunks away from the edit.
+    """
+    max_chars = int(max(200, min(2000, max_chars or 500)))  # clamp (same as pack_chunks)
+    min_chars = max_chars // 3
+    chunks: List[str] = []
+    cur = ""
+
+    for sentences in paragraphs:
+        for i, s in enumerate(sentences):
+            for piece in pack_chunks([s], max_chars=max_chars):
+                if cur and len(cur) + 1 + len(piece) > max_chars:
+                    chunks.append(cur)
+                    cur = ""
+                cur = f"{cur} {piece}" if cur else piece
+            last_in_para = i == len(sentences) - 1
+            if (cur and len(cur) >= min_chars and _TERMINAL_RE.search(cur)
+                    and (last_in_para or _is_anchor(s))):
+                chunks.append(cur)
+                cur = ""
+
+    if cur:
+        chunks.append(cur)
+    return chunks
+
+def chunk_text(text: str, max_chars: int = 500, stable: bool = False) -> List[str]:
     """
     Public API: returns packed chunks.
+    stable=True anchors boundaries to paragraphs/sentences (see pack_chunks_stable);
+    use it when chunks are cached and the same document is re-rendered after edits.
     """
-    return pack_chunks(split_sentences(text), max_chars=max_chars)
+    if not stable:
+        return pack_chunks(split_sentences(text), max_chars=max_chars)
+    paragraphs = [split_sentences(p) for p in _PARA_RE.split((text or "").strip())]
+    return pack_chunks_stable([p for p in paragraphs if p], max_chars=max_chars)
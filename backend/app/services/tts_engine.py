@@ -5,13 +5,15 @@ import os
 from typing import Optional, Tuple
 from pathlib import Path
 
-from .config.settings import (
+from ..config.settings import (
     USE_XTTS,
     PIPER_BIN,
     PIPER_MODEL,
     DATA_DIR,
+    TTS_FAKE_RTF,
 )
-from . import xtts_engine
+from . import xtts_engine, fake_engine
+from .cancellation import CancelToken, check
 import logging
 
 logger = logging.getLogger("cognomegafx.tts")
@@ -19,37 +21,85 @@ logger = logging.getLogger("cognomegafx.tts")
 def _choose_engine(explicit: Optional[str]) -> str:
     """
     Decide which engine to use if 'auto' or None.
-    Prefers XTTS if enabled; otherwise Piper if configured; otherwise error.
+    Prefers the fake engine if TTS_FAKE_RTF is set (load testing), then XTTS if enabled;
+    otherwise Piper if configured; otherwise error.
     """
     if explicit and explicit != "auto":
         return explicit
 
+    if TTS_FAKE_RTF > 0:
+        return "fake"
     if USE_XTTS:
         return "xtts"
     if (PIPER_BIN or "").strip() and (PIPER_MODEL or "").strip():
         return "piper"
     raise RuntimeError("No TTS engine available: enable XTTS or configure Piper in .env")
 
+def resolve_voice(voice: Optional[str], engine: Optional[str] = "auto") -> Tuple[str, bool]:
+    """
+    Map a UI voice id (see voices.list_voices) to (engine, cloned).
+    Unknown/empty voice ids fall back to `engine` without cloning.
+    """
+    if voice == "xtts_default":
+        return "xtts", False
+    if voice == "xtts_cloned":
+        return "xtts", True
+    if voice == "piper_default":
+        return "piper", False
+    return engine or "auto", False
+
+def preload(engine: Optional[str] = "auto") -> str:
+    """
+    Load the model behind `engine` now instead of on the first request
+    (batch workers call this once at startup). Returns the resolved engine.
+    """
+    engine_used = _choose_engine(engine)
+    if engine_used == "xtts":
+        xtts_engine.preload()
+    return engine_used
+
+def voice_identity(
+    engine: Optional[str] = "auto",
+    cloned: bool = False,
+    language: Optional[str] = None,
+) -> dict:
+    """
+    Resolved engine + model/voice/language settings that, together with the text,
+    fully determine synthesize_to_wav's output.
+    """
+    engine_used = _choose_engine(engine)
+    if engine_used == "xtts":
+        return {"engine": "xtts", **xtts_engine.voice_identity(cloned=cloned, language=language)}
+    if engine_used == "fake":
+        return {"engine": "fake", "rtf": TTS_FAKE_RTF}
+    return {"engine": engine_used, "model": PIPER_MODEL, "language": language or ""}
+
 def synthesize_to_wav(
     text: str,
     engine: Optional[str] = "auto",
     cloned: bool = False,
     language: Optional[str] = None,
+    cancel: Optional[CancelToken] = None,
 ) -> Tuple[str, str]:
     """
     Main entrypoint used by the router.
     Returns (absolute_output_path, engine_used).
+    Raises SynthesisCancelled if `cancel` trips before/while the engine runs.
     """
     text = (text or "").strip()
     if not text:
         raise ValueError("Empty text.")
 
     engine_used = _choose_engine(engine)
+    check(cancel)
 
     if engine_used == "xtts":
-        out_path = xtts_engine.synthesize_xtts(text=text, cloned=cloned, language=language)
+        out_path = xtts_engine.synthesize_xtts(text=text, cloned=cloned, language=language, cancel=cancel)
         return out_path, "xtts"
 
+    if engine_used == "fake":
+        return fake_engine.synthesize_fake(text, cancel=cancel), "fake"
+
     if engine_used == "piper":
         # (Optional) Implement Piper path here if you later enable it.
         # For now, fail clearly so the API caller sees a good error.
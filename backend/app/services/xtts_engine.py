@@ -4,30 +4,78 @@ from __future__ import annotations
 import os
 import uuid
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
-from .config.settings import (
+from ..config.settings import (
     USE_XTTS,
+    XTTS_REPLICAS,
+    XTTS_TORCH_THREADS,
+    XTTS_MODELS,
     XTTS_REFERENCE_VOICE,
     XTTS_LANGUAGE,
     DATA_DIR,  # ensure DATA_DIR points to backend/backend/data in settings
     HF_HOME,   # optional, but we read it for diagnostics
 )
+from .cancellation import CancelToken, SynthesisCancelled, check
+from .engine_manager import manager
 import logging
 
 logger = logging.getLogger("cognomegafx.xtts")
 
-# Lazy import TTS to avoid import cost at module load
-_TTS = None
+# Lazy import TTS to avoid import cost at module load.
+# Models live in the engine manager (memory budget, LRU/idle unload). Each model
+# gets XTTS_REPLICAS interchangeable keys; a replica serves one synthesis at a time,
+# so concurrent chunks never share a model instance.
+XTTS_MODEL_NAME = "tts_models/multilingual/multi-dataset/xtts_v2"
+
+def _load_tts(model: str):
+    # import here so that startup doesn't pay the cost until first request
+    from TTS.api import TTS
+    if os.path.isdir(model):
+        # local fine-tune directory
+        return TTS(model_path=model, config_path=os.path.join(model, "config.json"))
+    # Use the official multi-lang XTTS v2 model (or another hub model name)
+    return TTS(model_name=model)
+
+def _model_for(lang: str) -> str:
+    """Per-language fine-tune from XTTS_MODELS, else the stock multilingual model."""
+    return XTTS_MODELS.get(lang) or XTTS_MODEL_NAME
+
+def torch_threads() -> int:
+    """Intra-op threads per process: XTTS_TORCH_THREADS, else the cores split across replicas."""
+    return XTTS_TORCH_THREADS or max(1, (os.cpu_count() or 1) // XTTS_REPLICAS)
+
+def _import_tts() -> None:
+    # run before the manager's RSS baseline so the one-off TTS/torch import isn't
+    # counted in the first replica's footprint
+    import TTS.api  # noqa: F401
+    import torch
+    # replicas run concurrently in threads of this process; with torch's default
+    # (one thread per core each) they would oversubscribe the CPU
+    n = torch_threads()
+    if torch.get_num_threads() != n:
+        torch.set_num_threads(n)
+        logger.info("torch intra-op threads=%d (replicas=%d)", n, XTTS_REPLICAS)
+
+def _replica_keys(model: str) -> List[str]:
+    keys = [f"xtts:{model}#{i}" for i in range(XTTS_REPLICAS)]
+    for k in keys:
+        manager.register(k, lambda model=model: _load_tts(model), prepare=_import_tts)
+    return keys
+
+def _tts_replica(lang: str, cancel: Optional[CancelToken] = None):
+    """
+    Borrow a replica of the model for `lang` (context manager); loads on demand,
+    otherwise waits for one to be returned (giving up if `cancel` trips).
+    """
+    return manager.acquire(_replica_keys(_model_for(lang)), cancel=cancel)
 
-def _get_tts():
-    global _TTS
-    if _TTS is None:
-        # import here so that startup doesn't pay the cost until first request
-        from TTS.api import TTS
-        # Use the official multi-lang XTTS v2 model
-        _TTS = TTS(model_name="tts_models/multilingual/multi-dataset/xtts_v2")
-    return _TTS
+def preload(language: Optional[str] = None) -> None:
+    """Make sure at least one replica for `language` is loaded (borrow and return it)."""
+    if not USE_XTTS:
+        raise RuntimeError("XTTS is disabled by configuration (USE_XTTS=0).")
+    with _tts_replica(_effective_language(language)):
+        pass
 
 def has_reference_voice() -> bool:
     p = (XTTS_REFERENCE_VOICE or "").strip()
@@ -39,13 +87,32 @@ def _effective_language(language: Optional[str]) -> str:
         lang = (XTTS_LANGUAGE or "en").strip() or "en"
     return lang
 
+def voice_identity(cloned: bool = False, language: Optional[str] = None) -> dict:
+    """
+    Everything besides the text that determines the audio: used as a cache key.
+    For cloned voices the reference wav's size/mtime are included so replacing
+    the file invalidates cached audio.
+    """
+    lang = _effective_language(language)
+    ident = {"model": _model_for(lang), "language": lang, "cloned": bool(cloned)}
+    if cloned:
+        ref = (XTTS_REFERENCE_VOICE or "").strip()
+        try:
+            st = os.stat(ref)
+            ident["reference"] = [ref, st.st_size, int(st.st_mtime)]
+        except OSError:
+            ident["reference"] = [ref, None, None]
+    return ident
+
 def synthesize_xtts(
     text: str,
     cloned: bool = False,
     language: Optional[str] = None,
+    cancel: Optional[CancelToken] = None,
 ) -> str:
     """
     Returns absolute path to a generated wav file.
+    `cancel` is honoured while waiting for a replica; the XTTS call itself is not interruptible.
     """
     if not USE_XTTS:
         raise RuntimeError("XTTS is disabled by configuration (USE_XTTS=0).")
@@ -61,7 +128,6 @@ def synthesize_xtts(
     out_path = str(Path(DATA_DIR) / f"xtts_{uuid.uuid4().hex}.wav")
 
     # Build kwargs for TTS
-    tts = _get_tts()
     kwargs = {
         "text": text,
         "language": lang,
@@ -86,7 +152,11 @@ def synthesize_xtts(
     logger.info("XTTS synth start cloned=%s lang=%s out=%s", cloned, lang, out_path)
     try:
         # Do the synthesis
-        tts.tts_to_file(**kwargs)
+        with _tts_replica(lang, cancel) as tts:
+            check(cancel)
+            tts.tts_to_file(**kwargs)
+    except SynthesisCancelled:
+        raise
     except Exception as e:
         logger.exception("XTTS synthesis failed")
         # Re-throw with a compact message (router will wrap as 500)
@@ -105,4 +175,7 @@ def diagnostics():
         "XTTS_REFERENCE_VOICE": (XTTS_REFERENCE_VOICE or ""),
         "isfile": has_reference_voice(),
         "HF_HOME": (HF_HOME or ""),
+        "torch_threads": torch_threads(),
+        "XTTS_REPLICAS": XTTS_REPLICAS,
+        "XTTS_MODELS": dict(XTTS_MODELS),
     }
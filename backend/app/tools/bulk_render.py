@@ -0,0 +1,280 @@
+# app/tools/bulk_render.py
+"""
+Offline bulk rendering (IVR prompts, audiobook chapters, ...).
+
+Reads a JSONL manifest, one item per line:
+
+  {"id": "menu-01", "text": "...", "voice": "xtts_default", "language": "en"}
+
+(`voice`, `language` and `output` are optional) and renders every item to
+<out-dir>/<id>.wav on a process pool; each worker loads the model once.
+Items go through the same path as /speak_long: chunk_text -> synthesize_to_wav
+per chunk -> concat_wavs, and the final file is written atomically.
+
+Completion is appended to <manifest>.done as it happens and merged back into
+the manifest (status/rendered_to/rtf fields) at the end of the run, including on
+Ctrl-C, so rerunning the same command resumes where it stopped. `output` is
+input only and never written back.
+
+  cd backend
+  python -m app.tools.bulk_render prompts.jsonl --out-dir renders/ --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, Optional
+
+_SAFE_ID_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+# fields a run writes back into the manifest; replaced wholesale per item, so a
+# stale "error" doesn't outlive a later success (or "rtf" a later failure)
+_RESULT_FIELDS = ("status", "error", "rendered_to", "engine", "chunks", "audio_s", "synth_s", "rtf")
+
+# ---------------------------------------------------------------------------
+# Manifest
+# ---------------------------------------------------------------------------
+
+def load_manifest(path: Path) -> List[dict]:
+    items: List[dict] = []
+    seen = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise SystemExit(f"{path}:{lineno}: invalid JSON ({e})")
+            item_id = str(item.get("id") or "").strip()
+            if not item_id or not (item.get("text") or "").strip():
+                raise SystemExit(f"{path}:{lineno}: every item needs a non-empty 'id' and 'text'")
+            if item_id in seen:
+                raise SystemExit(f"{path}:{lineno}: duplicate id {item_id!r}")
+            seen.add(item_id)
+            item["id"] = item_id
+            items.append(item)
+    return items
+
+def journal_path(manifest: Path) -> Path:
+    return manifest.with_name(manifest.name + ".done")
+
+def read_journal(manifest: Path) -> Dict[str, dict]:
+    """Latest journal record per id (later lines win)."""
+    records: Dict[str, dict] = {}
+    jp = journal_path(manifest)
+    if not jp.exists():
+        return records
+    with open(jp, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line after a crash
+            if rec.get("id"):
+                records[rec["id"]] = rec
+    return records
+
+def write_manifest(manifest: Path, items: List[dict]) -> None:
+    """Atomically rewrite the manifest (temp file in the same dir + rename)."""
+    fd, tmp = tempfile.mkstemp(prefix=f".{manifest.name}.", dir=str(manifest.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for item in items:
+                f.write(json.dumps(item, ensure_ascii=False) + "\n")
+        if manifest.exists():
+            shutil.copymode(manifest, tmp)  # mkstemp creates 0600; keep the original mode
+        os.replace(tmp, manifest)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+def merge_results(manifest: Path, items: List[dict]) -> None:
+    records = read_journal(manifest)
+    if not records:
+        return
+    for item in items:
+        rec = records.get(item["id"])
+        if rec:
+            for k in _RESULT_FIELDS:
+                item.pop(k, None)
+            item.update({k: v for k, v in rec.items() if k != "id"})
+    write_manifest(manifest, items)
+    journal_path(manifest).unlink()
+
+def output_path(item: dict, out_dir: Path) -> Path:
+    if item.get("output"):
+        return Path(item["output"])
+    return out_dir / f"{_SAFE_ID_RE.sub('_', item['id'])}.wav"
+
+def check_outputs(items: List[dict], out_dir: Path) -> None:
+    """
+    Refuse manifests where two items resolve to the same file (e.g. ids "a/b" and
+    "a_b" both sanitize to a_b.wav): their workers would overwrite each other.
+    """
+    owners: Dict[Path, str] = {}
+    for item in items:
+        path = output_path(item, out_dir).resolve()
+        other = owners.setdefault(path, item["id"])
+        if other != item["id"]:
+            raise SystemExit(f"items {other!r} and {item['id']!r} would both render to {path}")
+
+def is_done(item: dict, out_dir: Path) -> bool:
+    return item.get("status") == "done" and output_path(item, out_dir).is_file()
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+def _worker_init(threads: int, engine: str) -> None:
+    # one model copy per process; keep each process to its share of the cores
+    os.environ["XTTS_REPLICAS"] = "1"
+    if threads > 0:
+        os.environ["XTTS_TORCH_THREADS"] = str(threads)
+        for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+            os.environ[var] = str(threads)
+        try:
+            import torch
+            torch.set_num_threads(threads)
+        except Exception:
+            pass
+    from ..services.tts_engine import preload
+    preload(engine)
+
+def render_item(item: dict, out_path: str, engine: str, max_chars: int) -> dict:
+    """
+    Render one manifest item to `out_path` (atomic). Runs in a worker process.
+    Returns the journal record for the item.
+    """
+    from ..services.text_chunker import chunk_text
+    from ..services.tts_engine import resolve_voice, synthesize_to_wav
+    from ..utils.wav_tools import concat_wavs, wav_duration
+
+    t0 = time.perf_counter()
+    use_engine, cloned = resolve_voice(item.get("voice"), engine)
+    parts = chunk_text(item["text"], max_chars=max_chars)
+    if not parts:
+        raise ValueError("No chunks to synthesize.")
+
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    workdir = tempfile.mkdtemp(prefix="bulk_", dir=str(Path(out_path).parent))
+    try:
+        part_paths: List[str] = []
+        engine_used = use_engine
+        for i, part in enumerate(parts, 1):
+            wav, engine_used = synthesize_to_wav(part, engine=use_engine, cloned=cloned,
+                                                 language=item.get("language"))
+            dst = os.path.join(workdir, f"part_{i:04d}.wav")
+            os.replace(wav, dst)
+            part_paths.append(dst)
+        tmp_out = os.path.join(workdir, "full.wav")
+        concat_wavs(part_paths, tmp_out)
+        os.replace(tmp_out, out_path)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    elapsed = time.perf_counter() - t0
+    audio = wav_duration(out_path)
+    return {
+        "id": item["id"],
+        "status": "done",
+        "rendered_to": out_path,
+        "engine": engine_used,
+        "chunks": len(parts),
+        "audio_s": round(audio, 3),
+        "synth_s": round(elapsed, 3),
+        "rtf": round(elapsed / audio, 4) if audio > 0 else None,
+    }
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="python -m app.tools.bulk_render",
+                                description="Render a JSONL manifest of texts to WAV files.")
+    p.add_argument("manifest", type=Path, help="JSONL with id/text[/voice/language/output] per line")
+    p.add_argument("--out-dir", type=Path, default=Path("renders"), help="where <id>.wav files go")
+    p.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 4),
+                   help="worker processes, each with its own model copy")
+    p.add_argument("--threads", type=int, default=0,
+                   help="torch/OMP threads per worker (default: library default)")
+    p.add_argument("--engine", default="auto", help="engine for items without a voice (auto|xtts|fake|...)")
+    p.add_argument("--max-chars", type=int, default=500, help="chunk size passed to chunk_text")
+    p.add_argument("--force", action="store_true", help="re-render items already marked done")
+    return p
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    manifest: Path = args.manifest
+    items = load_manifest(manifest)
+    check_outputs(items, args.out_dir)
+    merge_results(manifest, items)  # fold in a journal left by an interrupted run
+
+    todo = [it for it in items if args.force or not is_done(it, args.out_dir)]
+    print(f"{len(items)} items, {len(items) - len(todo)} already done, {len(todo)} to render "
+          f"with {args.workers} worker(s)", file=sys.stderr)
+    if not todo:
+        return 0
+
+    rendered = failed = 0
+    audio_total = 0.0
+    t_start = time.perf_counter()
+    ctx = multiprocessing.get_context("spawn")  # torch is not fork-safe
+    journal = open(journal_path(manifest), "a", encoding="utf-8")
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers, mp_context=ctx,
+                                 initializer=_worker_init, initargs=(args.threads, args.engine)) as pool:
+            futures: Dict[Future, dict] = {
+                pool.submit(render_item, it, str(output_path(it, args.out_dir)), args.engine, args.max_chars): it
+                for it in todo
+            }
+            pending = set(futures)
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        item = futures[fut]
+                        try:
+                            rec = fut.result()
+                            rendered += 1
+                            audio_total += rec["audio_s"]
+                            print(f"[done] {rec['id']} chunks={rec['chunks']} audio={rec['audio_s']:.1f}s "
+                                  f"synth={rec['synth_s']:.1f}s rtf={rec['rtf']}")
+                        except Exception as e:
+                            failed += 1
+                            rec = {"id": item["id"], "status": "error", "error": f"{type(e).__name__}: {e}"}
+                            print(f"[fail] {item['id']} {rec['error']}", file=sys.stderr)
+                        journal.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                        journal.flush()
+            except KeyboardInterrupt:
+                print("interrupted; cancelling queued items (rerun to resume)", file=sys.stderr)
+                for fut in pending:
+                    fut.cancel()
+                raise
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        journal.close()
+        merge_results(manifest, items)
+        wall = time.perf_counter() - t_start
+        print(f"rendered {rendered} item(s), {failed} failed in {wall:.1f}s: "
+              f"{rendered / wall * 60:.1f} items/min, {audio_total / wall:.2f}x realtime overall",
+              file=sys.stderr)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
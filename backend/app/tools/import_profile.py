@@ -0,0 +1,129 @@
+# app/tools/import_profile.py
+"""
+Import-time profile and budget check for `import app.main`.
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters and
+reports the per-module cost (self and cumulative, median over --runs), the
+total, and whether any deliberately-lazy heavy dependency got imported.
+
+  cd backend
+  python -m app.tools.import_profile                 # top modules
+  python -m app.tools.import_profile --json out.json # full report
+  python -m app.tools.import_profile --check         # exit 1 if over budget / heavy deps imported
+
+--check is the regression gate: total import time must stay under
+--budget-ms (default IMPORT_BUDGET_MS or 1500) and none of LAZY_MODULES may be
+imported by app.main. tests/test_import_profile.py runs the same check in the
+test suite.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+TARGET = "app.main"
+
+# top-level packages that must only load on first use / background preload
+LAZY_MODULES = ("TTS", "torch", "bs4", "readability", "lxml", "langdetect", "regex")
+
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "") or 1500)
+
+def _run_once(target: str) -> List[Tuple[str, int, int]]:
+    """One fresh interpreter; returns [(module, self_us, cumulative_us)] in import order."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=str(BACKEND_DIR), capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        tail = "\n".join(proc.stderr.strip().splitlines()[-15:])
+        raise SystemExit(f"`import {target}` failed:\n{tail}")
+    rows: List[Tuple[str, int, int]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time:       123 |        456 |   package.module"
+        fields = line[len("import time:"):].split("|")
+        try:
+            rows.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+        except (IndexError, ValueError):
+            continue
+    return rows
+
+def profile(target: str = TARGET, runs: int = 3) -> dict:
+    per_run: List[Dict[str, Tuple[int, int]]] = []
+    for _ in range(max(1, runs)):
+        per_run.append({name: (s, c) for name, s, c in _run_once(target)})
+
+    modules = sorted(set().union(*per_run))
+    table = []
+    for name in modules:
+        selfs = [r[name][0] for r in per_run if name in r]
+        cums = [r[name][1] for r in per_run if name in r]
+        table.append({
+            "module": name,
+            "self_ms": round(statistics.median(selfs) / 1000, 2),
+            "cumulative_ms": round(statistics.median(cums) / 1000, 2),
+        })
+    table.sort(key=lambda r: r["cumulative_ms"], reverse=True)
+
+    total = next((r["cumulative_ms"] for r in table if r["module"] == target), 0.0)
+    roots: Dict[str, float] = {}
+    for r in table:
+        root = r["module"].split(".")[0]
+        roots[root] = round(roots.get(root, 0.0) + r["self_ms"], 2)
+    lazy_hits = sorted({m.split(".")[0] for m in modules} & set(LAZY_MODULES))
+    return {
+        "target": target,
+        "runs": runs,
+        "python": sys.version.split()[0],
+        "total_ms": total,
+        "modules_imported": len(modules),
+        "by_package_ms": dict(sorted(roots.items(), key=lambda kv: kv[1], reverse=True)),
+        "heavy_imported": lazy_hits,
+        "modules": table,
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    p = argparse.ArgumentParser(prog="python -m app.tools.import_profile",
+                                description="Profile `import app.main` and enforce an import-time budget.")
+    p.add_argument("--runs", type=int, default=3, help="fresh interpreters to take the median over")
+    p.add_argument("--top", type=int, default=25, help="rows to print")
+    p.add_argument("--json", help="write the full report here")
+    p.add_argument("--check", action="store_true", help="exit 1 if over budget or a lazy dep was imported")
+    p.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = p.parse_args(argv)
+
+    report = profile(runs=args.runs)
+    report["budget_ms"] = args.budget_ms
+
+    print(f"import {report['target']}: {report['total_ms']:.1f} ms "
+          f"({report['modules_imported']} modules, median of {report['runs']})")
+    print("by package (self ms):", ", ".join(f"{k}={v}" for k, v in list(report["by_package_ms"].items())[:10]))
+    print(f"{'cumulative':>11} {'self':>9}  module")
+    for r in report["modules"][:args.top]:
+        print(f"{r['cumulative_ms']:>9.1f}ms {r['self_ms']:>7.1f}ms  {r['module']}")
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if not args.check:
+        return 0
+    failures = []
+    if report["total_ms"] > args.budget_ms:
+        failures.append(f"import time {report['total_ms']:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+    if report["heavy_imported"]:
+        failures.append(f"lazy dependencies imported at startup: {', '.join(report['heavy_imported'])}")
+    for f in failures:
+        print(f"FAIL: {f}", file=sys.stderr)
+    if not failures:
+        print(f"OK: within {args.budget_ms:.0f} ms budget, no lazy deps imported")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
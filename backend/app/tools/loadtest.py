@@ -0,0 +1,402 @@
+# app/tools/loadtest.py
+"""
+Asyncio load generator for the voice API.
+
+Replays a weighted mix of /speak (short prompts), /speak_long (articles) and
+/transcribe (wav uploads), ramping concurrency stage by stage, and writes a JSON
+report (latency / time-to-first-byte percentiles, throughput, error and 429
+rates, server-side RTF from X-TTS-RTF) that can be diffed between releases.
+
+Without --url it starts the app locally with uvicorn; by default that app uses
+the fake fixed-RTF engine (--fake-rtf, see services/fake_engine.py). Pass
+--fake-rtf 0 to load-test the real engine configured in .env.
+
+  cd backend
+  python -m app.tools.loadtest --stages 1,2,4,8 --stage-seconds 30 --out report.json
+  python -m app.tools.loadtest --url http://10.0.0.5:8000 --mix speak=1,speak_long=0
+
+Stdlib only (raw HTTP/1.1 over asyncio streams), so it runs from a bare venv.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+API = "/api/v1/voice"
+
+SHORT_PROMPTS = [
+    "Welcome back. How can I help you today?",
+    "Press one for billing, two for support, or stay on the line.",
+    "Your order has shipped and should arrive on Thursday.",
+    "Sorry, I didn't catch that. Could you say it again?",
+    "The meeting has been moved to three o'clock.",
+]
+
+_ARTICLE_SENTENCES = [
+    "The committee met on Tuesday to review the quarterly figures.",
+    "Revenue grew modestly, driven mostly by subscriptions in new regions.",
+    "Several members raised concerns about rising infrastructure costs.",
+    "A proposal to consolidate data centres was tabled for the next session.",
+    "Staff were thanked for their work during the migration.",
+    "The chair noted that customer satisfaction scores had improved again.",
+    "Questions from the floor focused on hiring plans and remote work.",
+    "The meeting closed with a short update on the accessibility roadmap.",
+]
+
+def default_article(paragraphs: int = 6, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    paras = []
+    for _ in range(paragraphs):
+        paras.append(" ".join(rng.choice(_ARTICLE_SENTENCES) for _ in range(rng.randint(3, 6))))
+    return "\n\n".join(paras)
+
+def silent_wav(seconds: float = 1.0, rate: int = 16000) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b"\x00\x00" * int(seconds * rate))
+    return buf.getvalue()
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Result:
+    scenario: str
+    status: int          # 0 = transport error / timeout
+    latency: float
+    ttfb: Optional[float]
+    nbytes: int = 0
+    rtf: Optional[float] = None
+    error: str = ""
+
+async def _request(
+    host: str,
+    port: int,
+    method: str,
+    path: str,
+    body: bytes,
+    content_type: str,
+    timeout: float,
+) -> Tuple[int, float, float, Dict[str, str], int]:
+    """
+    One HTTP/1.1 request with Connection: close.
+    Returns (status, ttfb, total, headers, body_bytes); times are from connect start.
+    """
+    t0 = time.perf_counter()
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    try:
+        head = (
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"X-Request-ID: loadtest-{uuid.uuid4().hex[:12]}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode("latin-1")
+        writer.write(head + body)
+        await writer.drain()
+
+        deadline = t0 + timeout
+        status_line = await asyncio.wait_for(reader.readline(), max(0.001, deadline - time.perf_counter()))
+        ttfb = time.perf_counter() - t0
+        status = int(status_line.split()[1]) if status_line else 0
+        headers: Dict[str, str] = {}
+        while True:
+            line = await asyncio.wait_for(reader.readline(), max(0.001, deadline - time.perf_counter()))
+            if line in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = line.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+        nbytes = 0
+        while True:
+            chunk = await asyncio.wait_for(reader.read(65536), max(0.001, deadline - time.perf_counter()))
+            if not chunk:
+                break
+            nbytes += len(chunk)
+        return status, ttfb, time.perf_counter() - t0, headers, nbytes
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+
+def _multipart(field_name: str, filename: str, data: bytes, mime: str) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field_name}"; filename="{filename}"\r\n'
+        f"Content-Type: {mime}\r\n\r\n"
+    ).encode() + data + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+
+class Workload:
+    def __init__(self, args: argparse.Namespace):
+        self.mix = _parse_mix(args.mix)
+        self.rng = random.Random(args.seed)
+        self.use_cache = bool(args.cache)
+        self.max_chars = args.max_chars
+        self.short = SHORT_PROMPTS
+        if args.long_text_file:
+            self.articles = [Path(args.long_text_file).read_text(encoding="utf-8")]
+        else:
+            self.articles = [default_article(seed=i) for i in range(4)]
+        self.upload = Path(args.upload_wav).read_bytes() if args.upload_wav else silent_wav()
+
+    def pick(self) -> str:
+        names = list(self.mix)
+        return self.rng.choices(names, weights=[self.mix[n] for n in names])[0]
+
+    def build(self, scenario: str) -> Tuple[str, bytes, str]:
+        """Returns (path, body, content_type)."""
+        if scenario == "speak":
+            payload = {"text": self.rng.choice(self.short), "engine": "auto"}
+            return f"{API}/speak", json.dumps(payload).encode(), "application/json"
+        if scenario == "speak_long":
+            payload = {
+                "text": self.rng.choice(self.articles),
+                "engine": "auto",
+                "max_chars": self.max_chars,
+                "use_cache": self.use_cache,
+            }
+            return f"{API}/speak_long", json.dumps(payload).encode(), "application/json"
+        if scenario == "transcribe":
+            body, ctype = _multipart("audio", "sample.wav", self.upload, "audio/wav")
+            return f"{API}/transcribe", body, ctype
+        raise ValueError(f"Unknown scenario: {scenario}")
+
+def _parse_mix(spec: str) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        name, _, w = item.partition("=")
+        mix[name.strip()] = float(w or 1)
+    mix = {k: v for k, v in mix.items() if v > 0}
+    unknown = set(mix) - {"speak", "speak_long", "transcribe"}
+    if unknown or not mix:
+        raise SystemExit(f"--mix: expected weights for speak/speak_long/transcribe, got {spec!r}")
+    return mix
+
+async def _one(host: str, port: int, wl: Workload, scenario: str, timeout: float) -> Result:
+    path, body, ctype = wl.build(scenario)
+    t0 = time.perf_counter()
+    try:
+        status, ttfb, total, headers, nbytes = await _request(host, port, "POST", path, body, ctype, timeout)
+    except Exception as e:
+        return Result(scenario, 0, time.perf_counter() - t0, None, error=type(e).__name__)
+    rtf = None
+    if "x-tts-rtf" in headers:
+        try:
+            rtf = float(headers["x-tts-rtf"])
+        except ValueError:
+            pass
+    return Result(scenario, status, total, ttfb, nbytes, rtf)
+
+async def run_stage(host: str, port: int, wl: Workload, concurrency: int, seconds: float, timeout: float) -> dict:
+    results: List[Result] = []
+    stop_at = time.perf_counter() + seconds
+
+    async def user() -> None:
+        while time.perf_counter() < stop_at:
+            results.append(await _one(host, port, wl, wl.pick(), timeout))
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(user() for _ in range(concurrency)))
+    wall = time.perf_counter() - t0
+    return summarize(results, concurrency, wall)
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0..100); None for an empty list."""
+    if not values:
+        return None
+    vals = sorted(values)
+    k = max(0, min(len(vals) - 1, math.ceil(q / 100.0 * len(vals)) - 1))
+    return round(vals[k], 4)
+
+def _dist(values: List[float]) -> dict:
+    return {"p50": percentile(values, 50), "p90": percentile(values, 90), "p99": percentile(values, 99),
+            "max": round(max(values), 4) if values else None}
+
+def _summarize_group(rs: List[Result], wall: float) -> dict:
+    n = len(rs)
+    ok = [r for r in rs if 200 <= r.status < 300]
+    errors = [r for r in rs if not (200 <= r.status < 300)]
+    by_status: Dict[str, int] = {}
+    for r in rs:
+        key = str(r.status) if r.status else f"transport:{r.error or 'error'}"
+        by_status[key] = by_status.get(key, 0) + 1
+    return {
+        "requests": n,
+        "ok": len(ok),
+        "throughput_rps": round(len(ok) / wall, 3) if wall > 0 else 0.0,
+        "error_rate": round(len(errors) / n, 4) if n else 0.0,
+        "rate_429": round(sum(1 for r in rs if r.status == 429) / n, 4) if n else 0.0,
+        "status": dict(sorted(by_status.items())),
+        "latency_s": _dist([r.latency for r in ok]),
+        "ttfb_s": _dist([r.ttfb for r in ok if r.ttfb is not None]),
+        "server_rtf": _dist([r.rtf for r in ok if r.rtf is not None]),
+        "bytes_per_response": round(sum(r.nbytes for r in ok) / len(ok)) if ok else 0,
+    }
+
+def summarize(results: List[Result], concurrency: int, wall: float) -> dict:
+    scenarios: Dict[str, List[Result]] = {}
+    for r in results:
+        scenarios.setdefault(r.scenario, []).append(r)
+    return {
+        "concurrency": concurrency,
+        "wall_s": round(wall, 3),
+        "overall": _summarize_group(results, wall),
+        "scenarios": {k: _summarize_group(v, wall) for k, v in sorted(scenarios.items())},
+    }
+
+def _fmt(v: Optional[float]) -> str:
+    return "-" if v is None else f"{v:.3f}"
+
+def print_table(stages: List[dict]) -> None:
+    print(f"{'conc':>5} {'scenario':<11} {'reqs':>6} {'rps':>8} {'err%':>6} {'429%':>6} "
+          f"{'p50':>8} {'p99':>8} {'ttfb50':>8} {'ttfb99':>8} {'rtf50':>7}")
+    for st in stages:
+        rows = [("ALL", st["overall"])] + list(st["scenarios"].items())
+        for name, g in rows:
+            print(f"{st['concurrency']:>5} {name:<11} {g['requests']:>6} {g['throughput_rps']:>8.2f} "
+                  f"{100 * g['error_rate']:>6.1f} {100 * g['rate_429']:>6.1f} "
+                  f"{_fmt(g['latency_s']['p50']):>8} {_fmt(g['latency_s']['p99']):>8} "
+                  f"{_fmt(g['ttfb_s']['p50']):>8} {_fmt(g['ttfb_s']['p99']):>8} "
+                  f"{_fmt(g['server_rtf']['p50']):>7}")
+
+# ---------------------------------------------------------------------------
+# Local server
+# ---------------------------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+async def _wait_healthy(host: str, port: int, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            status, *_ = await _request(host, port, "GET", "/health", b"", "text/plain", 2.0)
+            if status == 200:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+    raise SystemExit(f"Local server did not become healthy within {timeout:.0f}s")
+
+def start_local_server(port: int, fake_rtf: float, workers: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    if fake_rtf > 0:
+        env["TTS_FAKE_RTF"] = str(fake_rtf)
+    cmd = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+           "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+    return subprocess.Popen(cmd, cwd=str(BACKEND_DIR), env=env)
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="python -m app.tools.loadtest", description=__doc__.split("\n\n")[1])
+    p.add_argument("--url", help="target an already running server (default: start one locally)")
+    p.add_argument("--fake-rtf", type=float, default=0.3,
+                   help="local server only: fake engine RTF; 0 uses the real engine from .env (default 0.3)")
+    p.add_argument("--server-workers", type=int, default=1, help="local server only: uvicorn workers")
+    p.add_argument("--stages", default="1,2,4,8", help="comma-separated concurrency levels to ramp through")
+    p.add_argument("--stage-seconds", type=float, default=20.0, help="duration of each stage")
+    p.add_argument("--mix", default="speak=0.6,speak_long=0.3,transcribe=0.1",
+                   help="scenario weights, e.g. speak=1,speak_long=1,transcribe=0")
+    p.add_argument("--long-text-file", help="article text for /speak_long (default: built-in article)")
+    p.add_argument("--upload-wav", help="wav file for /transcribe (default: 1s of silence)")
+    p.add_argument("--max-chars", type=int, default=500, help="/speak_long max_chars")
+    p.add_argument("--cache", action="store_true", help="let /speak_long use the chunk cache (off by default)")
+    p.add_argument("--timeout", type=float, default=300.0, help="per-request timeout in seconds")
+    p.add_argument("--seed", type=int, default=1234)
+    p.add_argument("--label", default="", help="free-form tag stored in the report (e.g. release)")
+    p.add_argument("--out", help="write the JSON report here (default: stdout only)")
+    return p
+
+async def amain(args: argparse.Namespace) -> dict:
+    started = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    stages = [int(s) for s in args.stages.split(",") if s.strip()]
+    wl = Workload(args)
+    proc = None
+    if args.url:
+        u = urlsplit(args.url)
+        host, port = u.hostname or "127.0.0.1", u.port or 80
+    else:
+        host, port = "127.0.0.1", _free_port()
+        proc = start_local_server(port, args.fake_rtf, args.server_workers)
+    try:
+        await _wait_healthy(host, port, 120.0)
+        report_stages = []
+        for c in stages:
+            print(f"stage concurrency={c} for {args.stage_seconds:.0f}s ...", file=sys.stderr)
+            report_stages.append(await run_stage(host, port, wl, c, args.stage_seconds, args.timeout))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    return {
+        "meta": {
+            "label": args.label,
+            "started": started,
+            "target": args.url or f"local (fake_rtf={args.fake_rtf}, workers={args.server_workers}, "
+                                       f"replicas={os.getenv('XTTS_REPLICAS') or 1})",
+            "mix": wl.mix,
+            "stage_seconds": args.stage_seconds,
+            "cache": bool(args.cache),
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "stages": report_stages,
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    report = asyncio.run(amain(args))
+    print_table(report["stages"])
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2, sort_keys=True), encoding="utf-8")
+        print(f"report written to {args.out}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,6 +20,69 @@ def _read_wav_frames(path: str) -> Tuple[wave._wave_params, bytes]:
     except Exception as e:
         raise WavReadError(f"Failed to read WAV: {path} ({e})")
 
+# 16-bit mono 22.05kHz: safe default header for TTS pipelines when every input is empty
+_DEFAULT_PARAMS = wave._wave_params(nchannels=1, sampwidth=2, framerate=22050,
+                                    nframes=0, comptype='NONE', compname='not compressed')
+
+class WavAppender:
+    """
+    Incremental concatenation: append WAV parts one at a time as they become ready.
+    Same rules as concat_wavs (params of the first non-empty part, empty parts skipped,
+    WavParamMismatchError on mismatch). Use as a context manager; on error the partial
+    output file is removed.
+    """
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.params = None
+        self.parts = 0
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        self._out = None
+
+    def append(self, path: str) -> None:
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Missing WAV file(s): {path}")
+        params, frames = _read_wav_frames(path)
+        self.parts += 1
+        if not frames:
+            return
+        if self.params is None:
+            self.params = params
+            self._out = wave.open(self.output_path, "wb")
+            self._out.setparams(params)
+        elif params._replace(nframes=0) != self.params._replace(nframes=0):  # lengths differ, format must not
+            raise WavParamMismatchError(
+                f"Parameter mismatch in '{path}'. Expected {self.params}, got {params}."
+            )
+        self._out.writeframes(frames)
+
+    def close(self) -> str:
+        if self._out is None:
+            # all inputs were empty; write a 0-frame wav with a default-ish header
+            self._out = wave.open(self.output_path, "wb")
+            self._out.setparams(_DEFAULT_PARAMS)
+        self._out.close()
+        return self.output_path
+
+    def abort(self) -> None:
+        if self._out is not None:
+            try:
+                self._out.close()
+            except Exception:
+                pass
+        try:
+            os.remove(self.output_path)
+        except OSError:
+            pass
+
+    def __enter__(self) -> "WavAppender":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
 def concat_wavs(input_paths: List[str], output_path: str) -> str:
     """
     Concatenate multiple PCM WAV files into one.
@@ -36,40 +99,19 @@ def concat_wavs(input_paths: List[str], output_path: str) -> str:
     if missing:
         raise FileNotFoundError(f"Missing WAV file(s): {', '.join(missing)}")
 
-    params0 = None
-    collected: List[bytes] = []
-
-    # discover first non-empty to set params
-    for p in input_paths:
-        params, frames = _read_wav_frames(p)
-        if params0 is None and frames:
-            params0 = params
-            collected.append(frames)
-        elif params0 is None and not frames:
-            # still looking for first non-empty; skip
-            continue
-        else:
-            # params0 set; check compat if frames present
-            if frames and params != params0:
-                raise WavParamMismatchError(
-                    f"Parameter mismatch in '{p}'. Expected {params0}, got {params}."
-                )
-            if frames:
-                collected.append(frames)
-
-    if params0 is None:
-        # all inputs were empty; write a 0-frame wav with a default-ish header
-        # choose 16-bit mono 22.05kHz to be safe for TTS pipelines
-        params0 = wave._wave_params(nchannels=1, sampwidth=2, framerate=22050,
-                                    nframes=0, comptype='NONE', compname='not compressed')
-        collected = [b""]
-
-    # write output
-    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
-    with wave.open(output_path, "wb") as wo:
-        wo.setparams(params0)
-        for fr in collected:
-            if fr:
-                wo.writeframes(fr)
+    with WavAppender(output_path) as w:
+        for p in input_paths:
+            w.append(p)
 
     return output_path
+
+def wav_duration(path: str) -> float:
+    """
+    Duration in seconds (0.0 for empty/unreadable files); used for RTF reporting.
+    """
+    try:
+        with wave.open(path, "rb") as w:
+            rate = w.getframerate()
+            return w.getnframes() / float(rate) if rate else 0.0
+    except Exception:
+        return 0.0
@@ -0,0 +1,6 @@
+# tests/conftest.py
+# make `import app...` work when pytest is run from backend/ or the repo root
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,113 @@
+# tests/test_engine_manager.py
+import threading
+import time
+
+import pytest
+
+from app.services import engine_manager
+from app.services.engine_manager import EngineManager
+
+_MB = 1024 * 1024
+
+@pytest.fixture
+def rss(monkeypatch):
+    """Fake process RSS that loaders/unloaders move explicitly (100 MB per model)."""
+    state = {"bytes": 0}
+    monkeypatch.setattr(engine_manager, "_rss_bytes", lambda: state["bytes"])
+    return state
+
+def _register(m: EngineManager, rss: dict, key: str, mb: int = 100, unloaded=None) -> None:
+    def load():
+        rss["bytes"] += mb * _MB
+        return object()
+
+    def unload(_model):
+        rss["bytes"] -= mb * _MB
+        if unloaded is not None:
+            unloaded.append(key)
+
+    m.register(key, load, unload)
+
+def _use(m: EngineManager, key: str) -> None:
+    with m.acquire([key]):
+        pass
+
+def _resident(m: EngineManager) -> set:
+    return {s["key"] for s in m.stats()["models"] if s["resident"]}
+
+def test_lru_model_is_evicted_over_budget(rss):
+    m = EngineManager(budget_mb=250)
+    unloaded = []
+    for key in "abc":
+        _register(m, rss, key, unloaded=unloaded)
+
+    _use(m, "a")
+    _use(m, "b")
+    _use(m, "a")  # b is now least recently used
+    _use(m, "c")
+
+    assert unloaded == ["b"]
+    assert _resident(m) == {"a", "c"}
+    assert m.stats()["resident_mb"] == 200
+    assert m.counters["evictions"] == 1
+
+def test_busy_model_is_never_evicted(rss):
+    m = EngineManager(budget_mb=150)
+    for key in "ab":
+        _register(m, rss, key)
+
+    with m.acquire(["a"]):
+        _use(m, "b")  # over budget, but a is in use and the new model is never its own victim
+        assert _resident(m) == {"a", "b"}
+    assert m.counters["evictions"] == 0
+
+def test_idle_models_are_reaped(rss):
+    m = EngineManager(idle_unload_s=60)
+    unloaded = []
+    for key in "ab":
+        _register(m, rss, key, unloaded=unloaded)
+    _use(m, "a")
+
+    assert m.reap_idle() == 0  # not idle long enough yet
+    m._entries["a"].last_used -= 61
+    with m.acquire(["b"]):
+        m._entries["b"].last_used -= 61  # in use: never reaped, however stale
+        assert m.reap_idle() == 1
+
+    assert unloaded == ["a"]
+    assert _resident(m) == {"b"}
+    assert m.counters["idle_unloads"] == 1
+    assert rss["bytes"] == 100 * _MB
+
+def test_replicas_are_never_shared(rss):
+    m = EngineManager()
+    keys = ["r0", "r1"]
+    for key in keys:
+        _register(m, rss, key)
+
+    lock = threading.Lock()
+    busy = set()
+    peak = [0]
+    errors = []
+
+    def worker():
+        for _ in range(5):
+            with m.acquire(keys) as model:
+                with lock:
+                    if id(model) in busy:
+                        errors.append("model shared")
+                    busy.add(id(model))
+                    peak[0] = max(peak[0], len(busy))
+                time.sleep(0.005)
+                with lock:
+                    busy.discard(id(model))
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert peak[0] == 2
+    assert m.counters["loads"] == 2
@@ -0,0 +1,14 @@
+# tests/test_import_profile.py
+# the import-time regression gate (`python -m app.tools.import_profile --check`) as a test
+import pytest
+
+from app.tools import import_profile
+
+pytest.importorskip("fastapi")
+
+def test_app_main_imports_no_lazy_deps_and_stays_in_budget():
+    report = import_profile.profile(runs=3)
+
+    assert report["heavy_imported"] == []
+    slowest = ", ".join(f"{r['module']}={r['cumulative_ms']}ms" for r in report["modules"][:5])
+    assert report["total_ms"] <= import_profile.DEFAULT_BUDGET_MS, slowest
@@ -0,0 +1,52 @@
+# tests/test_long_tts.py
+import threading
+import wave
+
+import pytest
+
+from app.services import fake_engine, long_tts, tts_engine
+from app.services.cancellation import CancelToken, SynthesisCancelled
+
+@pytest.fixture
+def fake(monkeypatch, tmp_path):
+    """Fake engine at RTF 0.01 on 3 replicas, writing into tmp_path."""
+    monkeypatch.setattr(tts_engine, "TTS_FAKE_RTF", 0.01)
+    monkeypatch.setattr(fake_engine, "TTS_FAKE_RTF", 0.01)
+    monkeypatch.setattr(fake_engine, "DATA_DIR", tmp_path / "data")
+    monkeypatch.setattr(fake_engine, "XTTS_REPLICAS", 3)
+    monkeypatch.setattr(long_tts, "XTTS_REPLICAS", 3)
+    monkeypatch.setattr(long_tts, "SPEAK_LONG_MAX_PARALLEL", 3)
+    monkeypatch.setattr(long_tts, "_EXECUTOR", None)
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+    return tmp_path
+
+def _frames(path) -> bytes:
+    with wave.open(str(path), "rb") as w:
+        return w.readframes(w.getnframes())
+
+def test_parts_are_joined_in_order(fake):
+    # later parts are shorter, so they finish first when run in parallel
+    parts = [f"Part {i} " + "x" * (60 - 8 * i) for i in range(6)]
+    out = fake / "out.wav"
+
+    engine_used, hits = long_tts.render_long(parts, str(out), str(fake / "work"), engine="fake", use_cache=False)
+
+    expected = b"".join(fake_engine._tone(fake_engine.estimated_seconds(p)) for p in parts)
+    assert (engine_used, hits) == ("fake", 0)
+    assert _frames(out) == expected
+
+def test_cancel_stops_rendering_and_removes_output(fake):
+    parts = ["y" * 150] * 12  # 10 s of audio each, 0.1 s of fake synthesis
+    out = fake / "out.wav"
+    cancel = CancelToken()
+    threading.Timer(0.15, cancel.cancel, args=("disconnect",)).start()
+
+    with pytest.raises(SynthesisCancelled) as exc:
+        long_tts.render_long(parts, str(out), str(fake / "work"), engine="fake", use_cache=False, cancel=cancel)
+
+    assert exc.value.reason == "disconnect"
+    assert not out.exists()
+    long_tts._executor().shutdown(wait=True)
+    # chunks in flight at cancellation drop their audio instead of leaving it behind
+    assert not list((fake / "data").glob("*.wav"))
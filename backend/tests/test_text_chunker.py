@@ -0,0 +1,43 @@
+# tests/test_text_chunker.py
+import random
+import textwrap
+
+from app.services.text_chunker import chunk_text
+
+_WORDS = "alpha beta gamma delta epsilon zeta eta theta iota kappa lambda mu".split()
+
+def _sentence(rng: random.Random) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(4, 20))).capitalize() + "."
+
+def _paragraphs(n: int = 15, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    return [" ".join(_sentence(rng) for _ in range(rng.randint(2, 12))) for _ in range(n)]
+
+def test_stable_chunks_survive_local_edit():
+    paras = _paragraphs()
+    before = chunk_text("\n\n".join(paras), 500, stable=True)
+
+    edited = list(paras)
+    edited[3] = edited[3].replace("alpha", "ALPHA BETA GAMMA", 1)
+    sentences = edited[7].split(". ")
+    sentences.insert(2, "Inserted sentence here with words")
+    edited[7] = ". ".join(sentences)
+    after = chunk_text("\n\n".join(edited), 500, stable=True)
+
+    unchanged = set(before) & set(after)
+    # only the chunks around the two edits may differ
+    assert len(unchanged) >= len(before) - 4
+
+def test_stable_chunks_end_on_sentences_for_hard_wrapped_text():
+    text = "\n\n".join(textwrap.fill(p, 70) for p in _paragraphs(6, seed=7))
+    chunks = chunk_text(text, 500, stable=True)
+
+    assert len(chunks) > 1
+    assert all(c.endswith(".") for c in chunks)
+    assert all(len(c) <= 500 for c in chunks)
+    # same words as the input, just re-flowed
+    assert " ".join(chunks).split() == text.split()
+
+def test_default_mode_unchanged_by_stable_option():
+    text = " ".join(_paragraphs(3))
+    assert chunk_text(text, 500) == chunk_text(text, 500, stable=False)